@@ -0,0 +1,455 @@
+`timescale 1ns / 1ps
+
+// Bridge-level testbench for uart_ahb_bridge.
+// Feeds command bytes on rx_data/rx_dv at UART line rate (as uart_rx does),
+// shifts responses out through the real uart_tx so tx_busy has its actual
+// timing, and answers AHB with a zero-wait-state memory. Every address-phase
+// beat is logged and checked (HTRANS/HBURST/HSIZE/HADDR/HWDATA), as is every
+// byte the bridge hands to uart_tx.
+module uart_ahb_bridge_tb();
+    //=================================================================
+    // CLOCK, RESET, AND BRIDGE SIGNALS
+    //=================================================================
+    // 10 clocks per bit: one UART byte (start + 8 data + stop) takes
+    // BYTE_CLKS cycles on both RX and TX, so the RX/TX rate ratio matches
+    // the real link while keeping the simulation short.
+    localparam CLKS_PER_BIT = 10;
+    localparam BYTE_CLKS    = 10 * CLKS_PER_BIT;
+    localparam LOG_DEPTH    = 256;
+
+    reg hclk;
+    reg hresetn;
+    reg [7:0] rx_data;
+    reg rx_dv;
+    wire [7:0] tx_data;
+    wire tx_start, tx_busy, tx_line;
+
+    wire [31:0] haddr, hwdata;
+    wire hwrite;
+    wire [1:0] htrans;
+    wire [2:0] hsize, hburst;
+    wire [3:0] hprot;
+    reg  [31:0] hrdata;
+
+    uart_ahb_bridge dut (
+        .hclk(hclk), .hresetn(hresetn),
+        .rx_data(rx_data), .rx_dv(rx_dv),
+        .tx_data(tx_data), .tx_start(tx_start), .tx_busy(tx_busy),
+        .haddr(haddr), .hwdata(hwdata), .hwrite(hwrite),
+        .htrans(htrans), .hsize(hsize), .hburst(hburst), .hprot(hprot),
+        .hready(1'b1), .hrdata(hrdata), .hresp(2'b00)
+    );
+
+    uart_tx #(.CLK_FREQ(CLKS_PER_BIT), .BAUD_RATE(1)) u_tx (
+        .clk(hclk), .rst_n(hresetn), .start(tx_start), .din(tx_data), .tx(tx_line), .busy(tx_busy)
+    );
+
+    initial hclk = 0;
+    always #5 hclk = ~hclk;
+
+    //=================================================================
+    // AHB MEMORY SLAVE (4 KB, so bursts can cross a 1 KB page)
+    //=================================================================
+    // HWDATA is driven alongside HADDR in this SoC, so writes are taken in
+    // the address phase; read data is registered for the data phase.
+    reg [31:0] mem [0:1023];
+    always @(posedge hclk) begin
+        if (htrans[1]) begin
+            if (hwrite) mem[haddr[11:2]] <= hwdata;
+            else hrdata <= mem[haddr[11:2]];
+        end
+    end
+
+    //=================================================================
+    // MONITORS
+    //=================================================================
+    // Address-phase beats (HTRANS = NONSEQ/SEQ) in issue order
+    reg [1:0]  log_trans [0:LOG_DEPTH-1];
+    reg [2:0]  log_burst [0:LOG_DEPTH-1];
+    reg [2:0]  log_size  [0:LOG_DEPTH-1];
+    reg        log_write [0:LOG_DEPTH-1];
+    reg [31:0] log_addr  [0:LOG_DEPTH-1];
+    reg [31:0] log_data  [0:LOG_DEPTH-1];
+    integer    log_cyc   [0:LOG_DEPTH-1];
+    integer beat_wr, beat_rd;
+    // Bytes handed to uart_tx
+    reg [7:0] resp [0:LOG_DEPTH-1];
+    integer resp_wr, resp_rd;
+    // Link statistics
+    integer cyc;
+    integer rx_drops;        // bytes offered while the RX FIFO was full
+    integer rx_while_busy;   // bytes received while a response was shifting out
+
+    always @(posedge hclk) begin
+        cyc = cyc + 1;
+        if (hresetn) begin
+            if (htrans[1]) begin
+                log_trans[beat_wr] = htrans;
+                log_burst[beat_wr] = hburst;
+                log_size[beat_wr]  = hsize;
+                log_write[beat_wr] = hwrite;
+                log_addr[beat_wr]  = haddr;
+                log_data[beat_wr]  = hwdata;
+                log_cyc[beat_wr]   = cyc;
+                beat_wr = beat_wr + 1;
+            end
+            if (tx_start) begin
+                resp[resp_wr] = tx_data;
+                resp_wr = resp_wr + 1;
+            end
+            if (rx_dv && dut.rx_full) rx_drops = rx_drops + 1;
+            if (rx_dv && tx_busy) rx_while_busy = rx_while_busy + 1;
+        end
+    end
+
+    //=================================================================
+    // TEST VARIABLES
+    //=================================================================
+    integer pass_cnt;
+    integer fail_cnt;
+    integer i;
+    reg [31:0] word;
+    reg ok;
+
+    // Burst data pattern: 'tag' identifies the test, the low bits the address
+    function [31:0] pat(input [7:0] tag, input [31:0] a);
+        begin
+            pat = {tag, a[23:0]};
+        end
+    endfunction
+
+    //=================================================================
+    // CHECK / REPORT TASKS
+    //=================================================================
+    task check(input cond, input [8*64-1:0] what);
+        begin
+            if (cond) begin
+                pass_cnt = pass_cnt + 1;
+                $display("[%0t] TB: PASS - %0s", $time, what);
+            end else begin
+                fail_cnt = fail_cnt + 1;
+                $display("[%0t] TB: FAIL - %0s", $time, what);
+            end
+        end
+    endtask
+
+    // Compare logged beat 'n' against the expected address-phase signals
+    function beat_ok(input integer n, input [1:0] trans, input [2:0] burst,
+                     input wr, input [31:0] addr, input [31:0] data);
+        begin
+            beat_ok = log_trans[n] == trans && log_burst[n] == burst &&
+                      log_size[n] == 3'b010 && log_write[n] == wr &&
+                      log_addr[n] == addr && (!wr || log_data[n] == data);
+            if (!beat_ok)
+                $display("[%0t] TB:   beat %0d: HTRANS=%b HBURST=%b HSIZE=%b HWRITE=%b HADDR=0x%h HWDATA=0x%h (expected HTRANS=%b HBURST=%b HWRITE=%b HADDR=0x%h HWDATA=0x%h)",
+                         $time, n, log_trans[n], log_burst[n], log_size[n], log_write[n],
+                         log_addr[n], log_data[n], trans, burst, wr, addr, data);
+        end
+    endfunction
+
+    // Wait (bounded) until 'n' unconsumed response bytes have been sent
+    task wait_resp(input integer n);
+        integer t;
+        begin
+            t = 0;
+            while (resp_wr - resp_rd < n && t < 300 * BYTE_CLKS) begin
+                @(negedge hclk);
+                t = t + 1;
+            end
+        end
+    endtask
+
+    // Pop one big-endian response word (X if fewer than 4 bytes were sent)
+    task take_word(output [31:0] w);
+        begin
+            wait_resp(4);
+            if (resp_wr - resp_rd >= 4)
+                w = {resp[resp_rd], resp[resp_rd+1], resp[resp_rd+2], resp[resp_rd+3]};
+            else
+                w = 32'bx;
+            resp_rd = resp_rd + 4;
+            if (resp_rd > resp_wr) resp_rd = resp_wr;
+        end
+    endtask
+
+    // Exactly one 'K', and nothing after it for a few byte times
+    task expect_single_ack(input [8*64-1:0] what);
+        begin
+            wait_resp(1);
+            repeat (4 * BYTE_CLKS) @(negedge hclk);
+            check(resp_wr - resp_rd == 1 && resp[resp_rd] == 8'h4B, what);
+            resp_rd = resp_wr;
+        end
+    endtask
+
+    // Beats of a 'B' burst: INCR4 (NONSEQ + 3 SEQ on consecutive cycles)
+    // while at least 4 words remain and all 4 beats stay inside one 1 KB
+    // page, SINGLE otherwise. Consumes the logged beats.
+    task check_write_beats(input [7:0] tag, input [31:0] base, input integer n,
+                           input [8*64-1:0] what);
+        integer left, k, b;
+        reg [31:0] a;
+        begin
+            ok = (beat_wr - beat_rd == n);
+            if (!ok)
+                $display("[%0t] TB:   %0d beats issued, expected %0d", $time, beat_wr - beat_rd, n);
+            a = base;
+            left = n;
+            b = beat_rd;
+            while (ok && left > 0) begin
+                if (left >= 4 && a[9:0] <= 10'h3F0) begin
+                    for (k = 0; k < 4; k = k + 1) begin
+                        ok = ok && beat_ok(b, (k == 0) ? 2'b10 : 2'b11, 3'b011, 1'b1, a, pat(tag, a));
+                        if (k != 0 && log_cyc[b] != log_cyc[b-1] + 1) begin
+                            $display("[%0t] TB:   beat %0d: SEQ beat not on the next cycle", $time, b);
+                            ok = 0;
+                        end
+                        a = a + 4;
+                        b = b + 1;
+                    end
+                    left = left - 4;
+                end else begin
+                    ok = ok && beat_ok(b, 2'b10, 3'b000, 1'b1, a, pat(tag, a));
+                    a = a + 4;
+                    b = b + 1;
+                    left = left - 1;
+                end
+            end
+            check(ok, what);
+            beat_rd = beat_wr;
+        end
+    endtask
+
+    // Beats of a 'D' burst (one SINGLE read per word). Consumes the logged beats.
+    task check_read_beats(input [31:0] base, input integer n, input [8*64-1:0] what);
+        integer k;
+        begin
+            ok = (beat_wr - beat_rd == n);
+            if (!ok)
+                $display("[%0t] TB:   %0d beats issued, expected %0d", $time, beat_wr - beat_rd, n);
+            for (k = 0; ok && k < n; k = k + 1)
+                ok = beat_ok(beat_rd + k, 2'b10, 3'b000, 1'b0, base + 4 * k, 32'h0);
+            check(ok, what);
+            beat_rd = beat_wr;
+        end
+    endtask
+
+    //=================================================================
+    // UART DRIVER TASKS (one byte per BYTE_CLKS, MSB-first fields)
+    //=================================================================
+    task send_byte(input [7:0] b);
+        begin
+            @(negedge hclk);
+            rx_data = b;
+            rx_dv = 1;
+            @(negedge hclk);
+            rx_dv = 0;
+            repeat (BYTE_CLKS - 2) @(negedge hclk);
+        end
+    endtask
+
+    task send_word(input [31:0] w);
+        begin
+            send_byte(w[31:24]);
+            send_byte(w[23:16]);
+            send_byte(w[15:8]);
+            send_byte(w[7:0]);
+        end
+    endtask
+
+    // 'B' <addr> <n> <pat(tag, addr + 4*k)>*n
+    task send_burst_write(input [7:0] tag, input [31:0] base, input [7:0] n);
+        integer k;
+        begin
+            send_byte(8'h42);
+            send_word(base);
+            send_byte(n);
+            for (k = 0; k < n; k = k + 1)
+                send_word(pat(tag, base + 4 * k));
+        end
+    endtask
+
+    // 'D' <addr> <n>
+    task send_burst_read(input [31:0] base, input [7:0] n);
+        begin
+            send_byte(8'h44);
+            send_word(base);
+            send_byte(n);
+        end
+    endtask
+
+    // Read back 'n' response words and compare them with pat(tag, ...)
+    task check_read_data(input [7:0] tag, input [31:0] base, input integer n,
+                         input [8*64-1:0] what);
+        integer k;
+        begin
+            ok = 1;
+            for (k = 0; k < n; k = k + 1) begin
+                take_word(word);
+                if (word !== pat(tag, base + 4 * k)) begin
+                    $display("[%0t] TB:   word %0d: got 0x%h, expected 0x%h",
+                             $time, k, word, pat(tag, base + 4 * k));
+                    ok = 0;
+                end
+            end
+            check(ok, what);
+        end
+    endtask
+
+    task burst_write_test(input [7:0] tag, input [31:0] base, input [7:0] n,
+                          input [8*64-1:0] what);
+        begin
+            $display("[%0t] TB: 'B' burst write of %0d words at 0x%h", $time, n, base);
+            send_burst_write(tag, base, n);
+            expect_single_ack({what, ": single 'K'"});
+            check_write_beats(tag, base, n, {what, ": HTRANS/HBURST/HADDR/HWDATA per beat"});
+        end
+    endtask
+
+    //=================================================================
+    // MAIN SIMULATION SEQUENCE
+    //=================================================================
+    initial begin
+        $dumpfile("bridge_dump.vcd");
+        $dumpvars(0, uart_ahb_bridge_tb);
+
+        hresetn = 0;
+        rx_data = 0;
+        rx_dv = 0;
+        beat_wr = 0;
+        beat_rd = 0;
+        resp_wr = 0;
+        resp_rd = 0;
+        cyc = 0;
+        rx_drops = 0;
+        rx_while_busy = 0;
+        pass_cnt = 0;
+        fail_cnt = 0;
+        repeat (4) @(negedge hclk);
+        hresetn = 1;
+        $display("[%0t] TB: DUT Reset Complete", $time);
+
+        //=============================================================
+        // TEST 1: Single 'W' / 'R'
+        //=============================================================
+        $display("\n========================================================");
+        $display("TEST 1: Single 'W' / 'R' Frames");
+        $display("========================================================");
+        send_byte(8'h57);
+        send_word(32'h0000_0040);
+        send_word(32'hDEAD_BEEF);
+        expect_single_ack("'W': single 'K'");
+        ok = (beat_wr - beat_rd == 1) && beat_ok(beat_rd, 2'b10, 3'b000, 1'b1, 32'h40, 32'hDEAD_BEEF);
+        check(ok, "'W': one SINGLE write beat");
+        beat_rd = beat_wr;
+        send_byte(8'h52);
+        send_word(32'h0000_0040);
+        take_word(word);
+        check(word === 32'hDEAD_BEEF, "'R': read data");
+        check_read_beats(32'h40, 1, "'R': one SINGLE read beat");
+
+        //=============================================================
+        // TEST 2: 'B' burst writes (INCR4 groups + SINGLE remainder)
+        //=============================================================
+        $display("\n========================================================");
+        $display("TEST 2: 'B' Burst Writes, n = 1, 4, 5, 9");
+        $display("========================================================");
+        burst_write_test(8'hA1, 32'h0000_0100, 1, "'B' n=1");
+        burst_write_test(8'hA4, 32'h0000_0110, 4, "'B' n=4");
+        burst_write_test(8'hA5, 32'h0000_0120, 5, "'B' n=5");
+        burst_write_test(8'hA9, 32'h0000_0140, 9, "'B' n=9");
+
+        //=============================================================
+        // TEST 3: 'B' across a 1 KB page boundary
+        // Word index 253, n = 8: SINGLE x3 up to 0x3FC, INCR4 at
+        // 0x400-0x40C in the next page, SINGLE at 0x410.
+        //=============================================================
+        $display("\n========================================================");
+        $display("TEST 3: 'B' Burst Write Across a 1 KB Page Boundary");
+        $display("========================================================");
+        burst_write_test(8'hB8, 32'h0000_03F4, 8, "'B' n=8 from word 253");
+
+        //=============================================================
+        // TEST 4: 'D' burst reads
+        //=============================================================
+        $display("\n========================================================");
+        $display("TEST 4: 'D' Burst Reads");
+        $display("========================================================");
+        send_burst_read(32'h0000_0110, 4);
+        check_read_data(8'hA4, 32'h0000_0110, 4, "'D' n=4: data matches the n=4 burst write");
+        check_read_beats(32'h0000_0110, 4, "'D' n=4: four SINGLE read beats");
+        send_burst_read(32'h0000_03F4, 8);
+        check_read_data(8'hB8, 32'h0000_03F4, 8, "'D' n=8: data across the page boundary");
+        check_read_beats(32'h0000_03F4, 8, "'D' n=8: eight SINGLE read beats");
+
+        //=============================================================
+        // TEST 5: n = 0 is a no-op for both opcodes
+        //=============================================================
+        $display("\n========================================================");
+        $display("TEST 5: Zero-Length Bursts");
+        $display("========================================================");
+        send_burst_write(8'h00, 32'h0000_0200, 0);
+        expect_single_ack("'B' n=0: single 'K'");
+        check(beat_wr == beat_rd, "'B' n=0: no AHB beats");
+        // 'D' n=0 answers nothing: the 'R' behind it must get exactly its 4 bytes
+        send_burst_read(32'h0000_0200, 0);
+        send_byte(8'h52);
+        send_word(32'h0000_0040);
+        take_word(word);
+        repeat (4 * BYTE_CLKS) @(negedge hclk);
+        check(word === 32'hDEAD_BEEF && resp_wr == resp_rd, "'D' n=0: no response bytes");
+        check_read_beats(32'h40, 1, "'D' n=0: no AHB beats (only the 'R')");
+
+        //=============================================================
+        // TEST 6: Back-to-back pipelined frames while TX is busy
+        // 'D' n=4, 'W', 'R', 'B' n=4, 'R' sent without waiting for any
+        // response; later frames arrive while earlier replies shift out.
+        //=============================================================
+        $display("\n========================================================");
+        $display("TEST 6: Pipelined Frames While TX Is Busy");
+        $display("========================================================");
+        i = rx_while_busy;
+        send_burst_read(32'h0000_0140, 4);
+        send_byte(8'h57);
+        send_word(32'h0000_0300);
+        send_word(32'h1234_5678);
+        send_byte(8'h52);
+        send_word(32'h0000_0300);
+        send_burst_write(8'hC4, 32'h0000_0310, 4);
+        send_byte(8'h52);
+        send_word(32'h0000_031C);
+        check_read_data(8'hA9, 32'h0000_0140, 4, "pipelined: 'D' n=4 data");
+        wait_resp(1);
+        check(resp[resp_rd] == 8'h4B, "pipelined: 'W' ack");
+        resp_rd = resp_rd + 1;
+        take_word(word);
+        check(word === 32'h1234_5678, "pipelined: 'R' after 'W'");
+        wait_resp(1);
+        check(resp[resp_rd] == 8'h4B, "pipelined: single 'B' ack");
+        resp_rd = resp_rd + 1;
+        take_word(word);
+        check(word === pat(8'hC4, 32'h0000_031C), "pipelined: 'R' after 'B'");
+        repeat (4 * BYTE_CLKS) @(negedge hclk);
+        check(resp_wr == resp_rd, "pipelined: no extra response bytes");
+        check(beat_wr - beat_rd == 11, "pipelined: 4 + 1 + 1 + 4 + 1 AHB beats");
+        beat_rd = beat_wr;
+        check(rx_while_busy > i, "pipelined: frames arrived while TX was busy");
+
+        check(rx_drops == 0, "RX FIFO never overflowed");
+
+        //=============================================================
+        // SUMMARY
+        //=============================================================
+        $display("\n========================================================");
+        $display("UART-AHB BRIDGE TEST SUMMARY");
+        $display("========================================================");
+        $display("Passed: %0d / %0d", pass_cnt, pass_cnt + fail_cnt);
+        if (fail_cnt == 0)
+            $display("ALL BRIDGE TESTS PASSED");
+        else
+            $display("BRIDGE TESTS FAILED: %0d", fail_cnt);
+        $display("Simulation finished at time %0t", $time);
+        $display("========================================================\n");
+        $finish;
+    end
+endmodule
@@ -26,7 +26,8 @@ module ahb_aes_slave(
     // Address Map (Byte Offsets)
     // 0x00-0x0F: Key (128-bit)
     // 0x10-0x1F: Plaintext (128-bit)
-    // 0x20     : Control (Bit 0 = Start)
+    // 0x20     : Control (write: Bit 0 = Start)
+    //            Status  (read:  Bit 0 = Busy, Bit 1 = Done)
     // 0x30-0x3F: Ciphertext (128-bit)
 
     reg [127:0] key;
@@ -34,6 +35,7 @@ module ahb_aes_slave(
     reg [127:0] ciphertext;
     reg start;
     reg busy;
+    reg done;     // Set when the ciphertext is valid, cleared by Start
     
     // Simulation timer for behavioral model
     reg [3:0] timer;
@@ -48,6 +50,7 @@ module ahb_aes_slave(
             ciphertext <= 128'h0;
             start <= 1'b0;
             busy <= 1'b0;
+            done <= 1'b0;
             timer <= 0;
         end else begin
             // Default AHB outputs
@@ -73,6 +76,7 @@ module ahb_aes_slave(
                         if (hwdata[0]) begin
                             start <= 1'b1;
                             busy <= 1'b1;
+                            done <= 1'b0;
                             timer <= 4'd10; // Simulate processing latency
                         end
                     end
@@ -86,7 +90,7 @@ module ahb_aes_slave(
                     8'h08: hrdata <= key[63:32];        8'h0C: hrdata <= key[31:0];
                     8'h10: hrdata <= plaintext[127:96]; 8'h14: hrdata <= plaintext[95:64];
                     8'h18: hrdata <= plaintext[63:32];  8'h1C: hrdata <= plaintext[31:0];
-                    8'h20: hrdata <= {31'b0, busy};
+                    8'h20: hrdata <= {30'b0, done, busy};
                     8'h30: hrdata <= ciphertext[127:96]; 8'h34: hrdata <= ciphertext[95:64];
                     8'h38: hrdata <= ciphertext[63:32];  8'h3C: hrdata <= ciphertext[31:0];
                     default: hrdata <= 32'h0;
@@ -96,7 +100,7 @@ module ahb_aes_slave(
             // --- Behavioral AES Logic (XOR) ---
             if (busy) begin
                 if (timer > 0) timer <= timer - 1;
-                else begin busy <= 1'b0; ciphertext <= key ^ plaintext; end
+                else begin busy <= 1'b0; done <= 1'b1; ciphertext <= key ^ plaintext; end
             end
         end
     end
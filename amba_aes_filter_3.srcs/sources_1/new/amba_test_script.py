@@ -1,15 +1,20 @@
 import serial
-import serial.tools.list_ports
+import os
+import sys
 import time
+import argparse
+import csv
 import struct
-import random
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 # ==============================================================================
 # CONFIGURATION
 # ==============================================================================
-SERIAL_PORT = 'COM5'  # Change this to your Basys 3 COM port
-BAUD_RATE = 115200
-TIMEOUT = 1
+# Defaults; override with --port/--baud or the AMBA_SERIAL_PORT env variable
+SERIAL_PORT = os.environ.get('AMBA_SERIAL_PORT', 'COM5')  # Basys 3 COM port
+BAUD_RATE = 921600    # must match UART_BAUD in fpga_top.v
+USB_HEADROOM = 0.05   # read-timeout slack: ~3x the 16 ms default FTDI latency timer, plus jitter
 
 # Address Map
 ADDR_RAM1   = 0x00000000
@@ -25,6 +30,19 @@ ADDR_FILTER_STATUS = ADDR_FILTER + 0x0C  # STATUS    (R)       : [11:8]=in_cnt,
 # NOTE: addresses 0x20-0x28 are FIR coefficient registers, 0x2C-0x38 are FEC registers.
 # The filter does NOT expose per-stage debug outputs as memory-mapped registers.
 
+# Hex renderings of the addresses the tests print, formatted once at import
+_H_RAM1          = f"0x{ADDR_RAM1:08X}"
+_H_RAM2          = f"0x{ADDR_RAM2:08X}"
+_H_FILTER        = f"0x{ADDR_FILTER:08X}"
+_H_FILTER_OUT    = f"0x{ADDR_FILTER_OUT:08X}"
+_H_FILTER_CTRL   = f"0x{ADDR_FILTER_CTRL:08X}"
+_H_FILTER_STATUS = f"0x{ADDR_FILTER_STATUS:08X}"
+
+# AES register map (from ahb_aes_slave.v)
+ADDR_AES_CTRL   = ADDR_AES + 0x20   # CONTROL (W): bit0=START / STATUS (R): bit0=BUSY, bit1=DONE
+AES_STATUS_DONE = 1 << 1            # set when the ciphertext is valid, cleared by START
+AES_TIMEOUT     = 0.01              # completion is ~10 cycles; one round-trip normally sees DONE
+
 # ==============================================================================
 # FILTER GOLDEN MODEL
 # Replicates each RTL stage from wireline_rcvr_chain.v for pass/fail comparison.
@@ -35,115 +53,121 @@ ADDR_FILTER_STATUS = ADDR_FILTER + 0x0C  # STATUS    (R)       : [11:8]=in_cnt,
 GOLDEN_CYCLES = 30   # run each sample 30 cycles; ensures full pipeline flush
 FILTER_DW     = 12   # data width
 
-def _sc(val, bits=FILTER_DW):
-    """Sign-clip to signed 'bits'-bit integer."""
-    lo, hi = -(1 << (bits - 1)), (1 << (bits - 1)) - 1
-    return max(lo, min(hi, int(val)))
-
-def _vdiv(num, den):
-    """Truncate-toward-zero division matching Verilog signed '/'."""
-    if den == 0: return 0
-    sign = -1 if (num < 0) ^ (den < 0) else 1
-    return sign * (abs(num) // abs(den))
-
-class _CTLE:
-    """CTLE: dout = boosted_{N-1}; boosted = din + (diff_{N-1}>>alpha); 3-cycle latency."""
-    def __init__(self):
-        self.prev = 0; self.diff = 0; self.boosted = 0; self.dout = 0
-    def clock(self, din):
-        din = _sc(din)
-        nd = din - self.prev
-        nb = din + (self.diff >> 2)   # ALPHA_SHIFT=2
-        nd2 = _sc(self.boosted)
-        self.diff = nd; self.boosted = nb; self.prev = din; self.dout = nd2
-        return self.dout
-
-class _DCOffset:
-    """DC Offset: avg IIR (alpha=1/16); dout = din - old_avg; 1-cycle latency."""
-    def __init__(self):
-        self.avg = 0; self.dout = 0
-    def clock(self, din):
-        din = _sc(din)
-        nd = _sc(din - self.avg)
-        self.avg = self.avg + ((din - self.avg) >> 4)  # ALPHA_SHIFT=4
-        self.dout = nd
-        return self.dout
-
-class _FIREq:
-    """7-tap FIR Equalizer: coeffs=[-32,-64,128,256,128,-64,-32]/256; 1-cycle latency."""
-    _C = [-32, -64, 128, 256, 128, -64, -32]
-    def __init__(self):
-        self.sr = [0] * 7; self.dout = 0
-    def clock(self, din):
-        din = _sc(din)
-        acc = sum(self.sr[i] * self._C[i] for i in range(7))
-        nd = _sc(acc >> 8)   # divide by 256
-        self.sr = [din] + self.sr[:-1]
-        self.dout = nd
-        return self.dout
-
-class _DFE:
-    """DFE: dout = din - old_feedback; decision on old dout; DFE_COEFF=64; 1-cycle."""
-    def __init__(self):
-        self.prev_dec = 0; self.fb = 0; self.dout = 0
-    def clock(self, din):
-        din = _sc(din)
-        nd = _sc(din - self.fb)
-        new_fb = self.prev_dec * 64
-        new_dec = 1 if self.dout >= 0 else -1
-        self.fb = new_fb; self.prev_dec = new_dec; self.dout = nd
-        return self.dout
-
-class _Glitch:
-    """Glitch filter: 3-point median; only apply when spike > THRESHOLD=512."""
-    def __init__(self):
-        self.s1 = 0; self.s2 = 0; self.dout = 0
-    def clock(self, din):
-        din = _sc(din)
-        s1, s2 = self.s1, self.s2
-        median = sorted([din, s1, s2])[1]
-        nd = median if abs(din - s1) > 512 else din
-        self.s1 = din; self.s2 = s1; self.dout = nd
-        return self.dout
-
-class _LPF:
-    """LPF FIR (1,2,3,2,1)/9 — 3-cycle pipeline; Verilog truncate division."""
-    def __init__(self):
-        self.x = [0]*5; self.acc = 0; self.acc_d = 0; self.pipe = 0; self.dout = 0
-    def clock(self, din):
-        din = _sc(din)
-        ox = self.x
-        new_acc = ox[0] + (ox[1] << 1) + ox[2]*3 + (ox[3] << 1) + ox[4]
-        new_ad  = _vdiv(self.acc, 9)
-        new_p   = _sc(self.acc_d)
-        nd      = _sc(self.pipe)
-        self.x = [din] + ox[:4]
-        self.acc = new_acc; self.acc_d = new_ad; self.pipe = new_p; self.dout = nd
-        return self.dout
+# FIR Equalizer taps (/256)
+_FIR_C = (-32, -64, 128, 256, 128, -64, -32)
+
+# FilterChainModel state vector: one int64 slot per pipeline register
+#   [0:3]   CTLE: dout = boosted_{N-1}; boosted = din + (diff_{N-1}>>alpha); 3-cycle latency
+#   [3]     DC Offset: avg IIR (alpha=1/16); dout = din - old_avg; 1-cycle latency
+#   [4:11]  7-tap FIR Equalizer shift register (newest first); 1-cycle latency
+#   [11:14] DFE: dout = din - old_feedback; decision on old dout; DFE_COEFF=64; 1-cycle
+#   [14:16] Glitch filter: 3-point median; only apply when spike > THRESHOLD=512
+#   [16:24] LPF FIR (1,2,3,2,1)/9 window (newest first) + 3-cycle pipeline
+#   [24:26] 2-cycle FEC pipeline (no transform when no errors injected)
+_ST_SIZE = 26
+
+# numpy (and numba, when installed) is only needed by the golden model, so
+# _load_golden() imports it on first use rather than at startup; the RAM,
+# AES and power paths never pay for it.
+np = None
+
+def _chain_run(st, din, cycles):
+    """
+    Clock the fused chain 'cycles' times with constant (in-range) input din,
+    updating the state vector st in place. Returns the last output.
+    """
+    lo, hi = -(1 << (FILTER_DW - 1)), (1 << (FILTER_DW - 1)) - 1
+    c0, c1, c2, c3, c4, c5, c6 = _FIR_C
+    # int() keeps the pure-Python fallback on native ints (a no-op under numba)
+    c_prev, c_diff, c_boost = int(st[0]), int(st[1]), int(st[2])
+    dc_avg = int(st[3])
+    f0, f1, f2, f3 = int(st[4]), int(st[5]), int(st[6]), int(st[7])
+    f4, f5, f6 = int(st[8]), int(st[9]), int(st[10])
+    dfe_dec, dfe_fb, dfe_out = int(st[11]), int(st[12]), int(st[13])
+    gl_s1, gl_s2 = int(st[14]), int(st[15])
+    x0, x1, x2, x3, x4 = int(st[16]), int(st[17]), int(st[18]), int(st[19]), int(st[20])
+    lpf_acc, lpf_acc_d, lpf_pipe = int(st[21]), int(st[22]), int(st[23])
+    fec0, fec1 = int(st[24]), int(st[25])
+    out = fec0
+    # Each stage sign-clips its output register with one compare pair;
+    # stage inputs are already in range, so they are not re-clipped.
+    for _ in range(cycles):
+        # CTLE (ALPHA_SHIFT=2)
+        y = c_boost
+        if y > hi: y = hi
+        elif y < lo: y = lo
+        c_boost = din + (c_diff >> 2)
+        c_diff = din - c_prev
+        c_prev = din
+        # DC Offset (ALPHA_SHIFT=4)
+        e = y - dc_avg
+        dc_avg += e >> 4
+        if e > hi: e = hi
+        elif e < lo: e = lo
+        y = e
+        # FIR Equalizer (divide by 256)
+        acc = f0*c0 + f1*c1 + f2*c2 + f3*c3 + f4*c4 + f5*c5 + f6*c6
+        f6, f5, f4, f3, f2, f1, f0 = f5, f4, f3, f2, f1, f0, y
+        y = acc >> 8
+        if y > hi: y = hi
+        elif y < lo: y = lo
+        # DFE
+        y -= dfe_fb
+        if y > hi: y = hi
+        elif y < lo: y = lo
+        dfe_fb = dfe_dec * 64
+        dfe_dec = 1 if dfe_out >= 0 else -1
+        dfe_out = y
+        # Glitch
+        if abs(y - gl_s1) > 512:
+            nd = max(min(y, gl_s1), min(max(y, gl_s1), gl_s2))   # median of 3
+        else:
+            nd = y
+        gl_s2 = gl_s1; gl_s1 = y
+        y = nd
+        # LPF: |acc| <= 9 * 2048, so acc/9 never leaves the 12-bit range;
+        # Verilog '/' truncates toward zero
+        new_acc = x0 + (x1 << 1) + x2*3 + (x3 << 1) + x4
+        x4, x3, x2, x1, x0 = x3, x2, x1, x0, y
+        y = lpf_pipe
+        lpf_pipe = lpf_acc_d
+        lpf_acc_d = lpf_acc // 9 if lpf_acc >= 0 else -(-lpf_acc // 9)
+        lpf_acc = new_acc
+        # 2-stage FEC pipeline (data pass-through)
+        out = fec0
+        fec0, fec1 = y, fec0
+    st[0], st[1], st[2] = c_prev, c_diff, c_boost
+    st[3] = dc_avg
+    st[4], st[5], st[6], st[7], st[8], st[9], st[10] = f0, f1, f2, f3, f4, f5, f6
+    st[11], st[12], st[13] = dfe_dec, dfe_fb, dfe_out
+    st[14], st[15] = gl_s1, gl_s2
+    st[16], st[17], st[18], st[19], st[20] = x0, x1, x2, x3, x4
+    st[21], st[22], st[23] = lpf_acc, lpf_acc_d, lpf_pipe
+    st[24], st[25] = fec0, fec1
+    return out
 
 class FilterChainModel:
     """
     Full 6-stage golden model: CTLE->DC_Offset->FIR_EQ->DFE->Glitch->LPF.
     FEC is transparent (no error injection), adding 2 cycles with no data change.
+
+    All six stages are fused into one stepper (_chain_run) that keeps the
+    pipeline registers in locals for the duration of a call. Between calls
+    they live in a fixed-size int64 state vector (layout above _chain_run),
+    which lets the stepper compile with numba when it is installed.
     """
     def __init__(self):
-        self.ctle = _CTLE(); self.dc = _DCOffset(); self.fir = _FIREq()
-        self.dfe  = _DFE();  self.gl = _Glitch();  self.lpf = _LPF()
-        # 2-cycle FEC pipeline (no transform when no errors injected)
-        self.fec_pipe = [0, 0]
+        _load_golden()
+        self._st = np.zeros(_ST_SIZE, dtype=np.int64)
+
+    def _run(self, din, cycles):
+        """Clock the fused chain 'cycles' times with constant input din. Returns last output."""
+        din = max(_FILTER_LO, min(_FILTER_HI, int(din)))
+        return int(_chain_run(self._st, din, cycles))
 
     def clock(self, din):
         """Advance all stages by one clock cycle. Returns final 12-bit output."""
-        y = self.ctle.clock(din)
-        y = self.dc.clock(y)
-        y = self.fir.clock(y)
-        y = self.dfe.clock(y)
-        y = self.gl.clock(y)
-        y = self.lpf.clock(y)
-        # 2-stage FEC pipeline (data pass-through)
-        y_fec = self.fec_pipe[0]
-        self.fec_pipe = [y, self.fec_pipe[0]]
-        return y_fec
+        return self._run(din, 1)
 
     def run_sample(self, sample_12b):
         """
@@ -151,32 +175,208 @@ class FilterChainModel:
         (matching the testbench 'repeat(20) @(negedge hclk)' latency flush).
         Returns the 12-bit unsigned output at the end of the flush.
         """
-        out = 0
-        for _ in range(GOLDEN_CYCLES):
-            out = self.clock(sample_12b)
-        return out & 0xFFF
+        return self._run(sample_12b, GOLDEN_CYCLES) & 0xFFF
+
+    def run_batch(self, samples):
+        """
+        Vectorized equivalent of constructing a fresh model and calling
+        run_sample() on each entry of 'samples' in turn. Does not touch this
+        instance's clocked state. Returns an array of 12-bit unsigned outputs.
+        """
+        x = np.repeat(np.asarray(samples, dtype=np.int32), GOLDEN_CYCLES)
+        y = _lpf_v(_glitch_v(_dfe_v(_fir_v(_dc_offset_v(_ctle_v(x))))))
+        y = _delay(y, 1)   # FEC pass-through (see clock())
+        return y[GOLDEN_CYCLES - 1::GOLDEN_CYCLES] & 0xFFF
+
+# ------------------------------------------------------------------------------
+# Vectorized stages: each maps a whole per-cycle input stream (starting from
+# reset) to the stage's per-cycle output stream, bit-exact with
+# FilterChainModel.clock(). Inter-stage streams are 12-bit values stored as
+# int16 (CTLE/glitch differences stay within +/-4095); the convolutions
+# widen to int32 through the int32 tap arrays. Feed-forward stages use NumPy passes; the
+# recursive ones (DC offset, DFE) are scalar loops JIT-compiled when numba
+# is installed. As in the stepper, only stage outputs are clipped: every
+# stage after CTLE receives an already in-range stream.
+# ------------------------------------------------------------------------------
+_FILTER_LO, _FILTER_HI = -(1 << (FILTER_DW - 1)), (1 << (FILTER_DW - 1)) - 1
+_FIR_TAPS = _LPF_TAPS = None   # int32 tap arrays, built by _load_golden()
+
+def _clip_v(x):
+    return np.clip(x, _FILTER_LO, _FILTER_HI)
+
+def _delay(x, n):
+    """Delay stream by n cycles (registers reset to 0)."""
+    return np.concatenate((np.zeros(n, dtype=x.dtype), x[:len(x) - n]))
+
+def _ctle_v(x):
+    d = _clip_v(x).astype(np.int16)
+    diff = d - _delay(d, 1)
+    boosted = d + (_delay(diff, 1) >> 2)
+    return _clip_v(_delay(boosted, 1))
+
+def _dc_offset_v(x):
+    out = np.empty_like(x)
+    avg = np.int32(0)
+    for n in range(x.shape[0]):
+        e = np.int32(x[n] - avg)
+        avg += e >> 4
+        if e > _FILTER_HI: e = _FILTER_HI
+        elif e < _FILTER_LO: e = _FILTER_LO
+        out[n] = e
+    return out
+
+def _fir_v(x):
+    acc = np.convolve(x, _FIR_TAPS, mode='full')[:len(x)]
+    return _clip_v(_delay(acc, 1) >> 8).astype(np.int16)
+
+def _dfe_v(x):
+    out = np.empty_like(x)
+    prev_dec = np.int32(0); fb = np.int32(0); dout = np.int32(0)
+    for n in range(x.shape[0]):
+        nd = np.int32(x[n] - fb)
+        if nd > _FILTER_HI: nd = _FILTER_HI
+        elif nd < _FILTER_LO: nd = _FILTER_LO
+        fb = np.int32(prev_dec * 64)
+        prev_dec = np.int32(1) if dout >= 0 else np.int32(-1)
+        dout = nd
+        out[n] = nd
+    return out
+
+def _glitch_v(d):
+    s1, s2 = _delay(d, 1), _delay(d, 2)
+    median = np.maximum(np.minimum(d, s1), np.minimum(np.maximum(d, s1), s2))
+    return np.where(np.abs(d - s1) > 512, median, d)
+
+def _lpf_v(x):
+    acc = np.convolve(x, _LPF_TAPS, mode='full')[:len(x)]
+    acc = _delay(acc, 4)
+    # Verilog truncating '/'; |acc| <= 9 * 2048 so the result stays in range
+    return (np.sign(acc) * (np.abs(acc) // 9)).astype(np.int16)
+
+@functools.lru_cache(maxsize=None)
+def _load_golden():
+    """
+    Import numpy, build the tap arrays and, when numba is installed,
+    JIT-wrap the scalar kernels. Runs once, from the first FilterChainModel.
+    """
+    global np, _FIR_TAPS, _LPF_TAPS, _chain_run, _dc_offset_v, _dfe_v
+    import numpy as np
+    _FIR_TAPS = np.array(_FIR_C, dtype=np.int32)
+    _LPF_TAPS = np.array((1, 2, 3, 2, 1), dtype=np.int32)
+    try:
+        from numba import njit
+    except ImportError:   # numba is optional; recursive stages fall back to Python loops
+        return
+    _chain_run = njit(cache=True)(_chain_run)
+    _dc_offset_v = njit(cache=True)(_dc_offset_v)
+    _dfe_v = njit(cache=True)(_dfe_v)
 
 # ==============================================================================
 # UART DRIVER
 # ==============================================================================
-def open_serial():
+# Precompiled frame formats (big-endian): avoids re-parsing the format string
+# on every UART op.
+_WCMD  = struct.Struct('>BII')   # 'W' + addr + data
+_RCMD  = struct.Struct('>BI')    # 'R' + addr
+_RRESP = struct.Struct('>I')     # read data
+_BCMD  = struct.Struct('>BIB')   # 'B'/'D' + base addr + word count (burst header)
+BURST_MAX = 255                  # count is one byte
+# Reusable single-op command buffers (filled with pack_into, no per-op allocation)
+_WBUF = bytearray(_WCMD.size)
+_RBUF = bytearray(_RCMD.size)
+
+@functools.lru_cache(maxsize=None)
+def _rresp_n(n):
+    """Struct for n concatenated read responses (batch reads)."""
+    return struct.Struct(f'>{n}I')
+
+@functools.lru_cache(maxsize=None)
+def _ack_n(n):
+    """Expected response for n pipelined writes."""
+    return b'K' * n
+
+def _set_low_latency(ser):
+    """
+    Best-effort: every AHB response is shorter than a USB packet, so the FTDI
+    bridge holds it for the full latency timer (16 ms default) before sending.
+    On Linux, ASYNC_LOW_LATENCY makes ftdi_sio drop the timer to 1 ms. The
+    Windows driver only exposes it in Device Manager (Port Settings ->
+    Advanced -> Latency Timer); there we just enlarge the driver buffers.
+    """
+    if hasattr(ser, 'set_low_latency_mode'):     # POSIX backend
+        try:
+            ser.set_low_latency_mode(True)
+            return
+        except (OSError, ValueError) as e:
+            print(f"[*] Could not enable low-latency mode: {e}")
+    if hasattr(ser, 'set_buffer_size'):          # Windows backend
+        ser.set_buffer_size(rx_size=65536, tx_size=65536)
+        print("[*] Tip: set the FTDI Latency Timer to 1 ms in Device Manager for faster round-trips.")
+
+def _xfer_timeout(nbytes, baud):
+    """Read timeout for a transfer of nbytes (command + response): 10 bit
+    times per byte, at least 5 ms, plus USB_HEADROOM. The headroom covers an
+    untuned FTDI latency timer (Windows) with margin for USB/scheduler jitter;
+    a read that times out early leaves late bytes to desync the next command."""
+    return max(0.005, nbytes * 10 / baud) + USB_HEADROOM
+
+def _fit_timeout(ser, nbytes):
+    """Raise ser.timeout so an nbytes transfer fits; never lowers it, so the
+    port is only reconfigured the first time a larger batch is issued."""
+    t = _xfer_timeout(nbytes, ser.baudrate)
+    if ser.timeout is not None and ser.timeout < t:
+        ser.timeout = t
+
+def open_serial(port=SERIAL_PORT, baud=BAUD_RATE):
+    """
+    Open the bridge's UART. The baud rate is fixed in the bitstream: the
+    default (921600) requires uart_rx/uart_tx to be built with
+    UART_BAUD = 921600 in fpga_top.v (CLKS_PER_BIT = 108 at 100 MHz). The
+    driver also needs the bridge from this series (RX FIFO for pipelined
+    batches, 'B'/'D' burst opcodes); older bitstreams are not supported at
+    any baud rate. The read timeout is sized from
+    the byte time of a single-op round-trip and grown per batch.
+    """
     try:
-        ser = serial.Serial(SERIAL_PORT, BAUD_RATE, timeout=TIMEOUT)
-        print(f"[+] Connected to {SERIAL_PORT} at {BAUD_RATE} baud.")
+        ser = serial.Serial(port, baud, timeout=_xfer_timeout(_WCMD.size + _RRESP.size, baud))
+        print(f"[+] Connected to {port} at {baud} baud.")
+        _set_low_latency(ser)
         return ser
     except serial.SerialException as e:
         print(f"[-] Error opening serial port: {e}")
         print("[*] Listing available ports:")
-        ports = serial.tools.list_ports.comports()
+        from serial.tools import list_ports   # only needed on this error path
+        ports = list_ports.comports()
         for p in ports:
             print(f"    {p.device} - {p.description}")
         return None
 
+def _resync(ser, pending):
+    """
+    Recover stream alignment after a short read: wait out up to 'pending'
+    response bytes that may still be in flight (one more read timeout), then
+    drop whatever is left so the next command's reply starts aligned.
+    """
+    if pending > 0:
+        ser.read(pending)
+    ser.reset_input_buffer()
+
+def _read_resp(ser, n, owed=0):
+    """
+    Read an n-byte response. Every short-read path goes through here: on a
+    timeout the rest of the response, plus 'owed' bytes of responses queued
+    behind it, are handed to _resync() so the caller only reports the failure.
+    """
+    raw = ser.read(n)
+    if len(raw) != n:
+        _resync(ser, n - len(raw) + owed)
+    return raw
+
 def ahb_write(ser, addr, data):
     # Protocol: 'W' (0x57) + 4B Addr + 4B Data -> Returns 'K' (0x4B)
-    cmd = struct.pack('>BII', 0x57, addr, data) # Big-endian
-    ser.write(cmd)
-    resp = ser.read(1)
+    _WCMD.pack_into(_WBUF, 0, 0x57, addr, data) # Big-endian
+    ser.write(_WBUF)
+    resp = _read_resp(ser, 1)
     if resp == b'K':
         return True
     else:
@@ -185,46 +385,183 @@ def ahb_write(ser, addr, data):
 
 def ahb_read(ser, addr):
     # Protocol: 'R' (0x52) + 4B Addr -> Returns 4B Data
-    cmd = struct.pack('>BI', 0x52, addr)
-    ser.write(cmd)
-    resp = ser.read(4)
+    _RCMD.pack_into(_RBUF, 0, 0x52, addr)
+    ser.write(_RBUF)
+    resp = _read_resp(ser, 4)
     if len(resp) == 4:
-        return struct.unpack('>I', resp)[0]
+        return _RRESP.unpack(resp)[0]
     else:
         print(f"[-] Read failed at 0x{addr:08X}. Resp len: {len(resp)}")
         return None
 
+# Pipelined variants: concatenate N command frames into one ser.write() and
+# collect all N responses with one ser.read(), so a batch costs a single UART
+# round-trip instead of N. The bridge's RX FIFO buffers the queued frames.
+def ahb_write_batch(ser, pairs):
+    # pairs: [(addr, data), ...] -> Returns True if every write was ACKed
+    buf = bytearray(_WCMD.size * len(pairs))
+    for i, (a, d) in enumerate(pairs):
+        _WCMD.pack_into(buf, i * _WCMD.size, 0x57, a, d)
+    _fit_timeout(ser, len(buf) + len(pairs))
+    ser.write(buf)
+    resp = _read_resp(ser, len(pairs))
+    if resp == _ack_n(len(pairs)):
+        return True
+    # Slow path: locate the first bad ACK for reporting
+    for i, (a, _) in enumerate(pairs):
+        if resp[i:i+1] != b'K':
+            print(f"[-] Write failed at 0x{a:08X} (batch op {i}). Resp: {resp[i:i+1]}")
+            return False
+    return False
+
+def ahb_read_batch(ser, addrs):
+    # addrs: [addr, ...] -> Returns list of 4B words, or None on short read
+    buf = bytearray(_RCMD.size * len(addrs))
+    for i, a in enumerate(addrs):
+        _RCMD.pack_into(buf, i * _RCMD.size, 0x52, a)
+    _fit_timeout(ser, len(buf) + 4 * len(addrs))
+    ser.write(buf)
+    raw = _read_resp(ser, 4 * len(addrs))
+    if len(raw) == 4 * len(addrs):
+        return list(_rresp_n(len(addrs)).unpack(raw))
+    else:
+        print(f"[-] Batch read failed at 0x{addrs[len(raw) // 4]:08X}. Resp len: {len(raw)}")
+        return None
+
+# Burst variants: one command frame covers 'n' consecutive words starting at
+# 'base'. A burst write is ACKed once after its last word and a burst read
+# returns all n words, so a contiguous register window costs one header plus
+# its data on the wire. On the AHB side the bridge issues burst writes as
+# INCR4 bursts wherever 4 words remain (e.g. a 128-bit AES key or plaintext
+# block), and the rest as SINGLE transfers.
+def ahb_write_burst(ser, base, words):
+    # Protocol: 'B' (0x42) + 4B Addr + 1B Count + 4B Data * Count -> Returns 'K'
+    n = len(words)
+    if n > BURST_MAX:
+        raise ValueError(f"burst of {n} words exceeds BURST_MAX ({BURST_MAX})")
+    buf = bytearray(_BCMD.size + 4 * n)
+    _BCMD.pack_into(buf, 0, 0x42, base, n)
+    _rresp_n(n).pack_into(buf, _BCMD.size, *words)
+    _fit_timeout(ser, len(buf) + 1)
+    ser.write(buf)
+    resp = _read_resp(ser, 1)
+    if resp == b'K':
+        return True
+    else:
+        print(f"[-] Burst write failed at 0x{base:08X} ({n} words). Resp: {resp}")
+        return False
+
+def ahb_read_burst(ser, base, n):
+    # Protocol: 'D' (0x44) + 4B Addr + 1B Count -> Returns 4B Data * Count
+    if n > BURST_MAX:
+        raise ValueError(f"burst of {n} words exceeds BURST_MAX ({BURST_MAX})")
+    _fit_timeout(ser, _BCMD.size + 4 * n)
+    ser.write(_BCMD.pack(0x44, base, n))
+    raw = _read_resp(ser, 4 * n)
+    if len(raw) == 4 * n:
+        return list(_rresp_n(n).unpack(raw))
+    else:
+        print(f"[-] Burst read failed at 0x{base + len(raw) // 4 * 4:08X}. Resp len: {len(raw)}")
+        return None
+
+def wait_ready(ser, status_addr, ready_mask, timeout=0.1):
+    """
+    Poll status_addr until any bit of ready_mask is set, instead of sleeping
+    for a fixed time.
+    Returns the last status word read (check it against ready_mask if the
+    timeout matters), or None on a read error.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        val = ahb_read(ser, status_addr)
+        if val is None or val & ready_mask or time.monotonic() >= deadline:
+            return val
+
 # ==============================================================================
 # TEST MODULES
 # ==============================================================================
 def test_ram(ser):
     print("\n--- Testing RAM (Slave 1 & 2) ---")
-    
-    # Test Slave 1
     val1 = 0xDEADBEEF
-    print(f"[*] Writing 0x{val1:08X} to RAM1 (0x{ADDR_RAM1:08X})...")
-    ahb_write(ser, ADDR_RAM1, val1)
-    read1 = ahb_read(ser, ADDR_RAM1)
+    val2 = 0xCAFEBABE
+
+    # Both slaves are written in one pipelined batch, then read back in another
+    print(f"[*] Writing 0x{val1:08X} to RAM1 ({_H_RAM1})...")
+    print(f"[*] Writing 0x{val2:08X} to RAM2 ({_H_RAM2})...")
+    ahb_write_batch(ser, [(ADDR_RAM1, val1), (ADDR_RAM2, val2)])
+    read1, read2 = ahb_read_batch(ser, [ADDR_RAM1, ADDR_RAM2]) or (None, None)
+
+    # Test Slave 1
     if read1 is not None:
-        print(f"[*] Read back: 0x{read1:08X}")
+        print(f"[*] RAM1 read back: 0x{read1:08X}")
         if read1 == val1: print("[+] RAM1 Test PASS")
         else: print("[-] RAM1 Test FAIL")
     else:
         print("[-] RAM1 Test FAIL (Read Error)")
 
     # Test Slave 2
-    val2 = 0xCAFEBABE
-    print(f"[*] Writing 0x{val2:08X} to RAM2 (0x{ADDR_RAM2:08X})...")
-    ahb_write(ser, ADDR_RAM2, val2)
-    read2 = ahb_read(ser, ADDR_RAM2)
     if read2 is not None:
-        print(f"[*] Read back: 0x{read2:08X}")
+        print(f"[*] RAM2 read back: 0x{read2:08X}")
         if read2 == val2: print("[+] RAM2 Test PASS")
         else: print("[-] RAM2 Test FAIL")
     else:
         print("[-] RAM2 Test FAIL (Read Error)")
 
-def test_filter(ser):
+# Per-sample filter frame: prime write, STATUS + DATA_OUT pop (discards the
+# stale capture), settled write, STATUS + DATA_OUT pop. The bridge executes a
+# queued command only once its last byte has arrived, i.e. at least 5 byte
+# times after the previous one, so each 6-cycle capture has long landed in
+# the output FIFO before the STATUS read that follows its write.
+_FSTEP_HALF = (_WCMD.pack(0x57, ADDR_FILTER, 0) +
+               _RCMD.pack(0x52, ADDR_FILTER_STATUS) +
+               _RCMD.pack(0x52, ADDR_FILTER_OUT))
+_FSTEP_DIN  = (1 + 4, len(_FSTEP_HALF) + 1 + 4)   # offsets of the two DATA_IN words
+_FSTEP_RESP = struct.Struct('>cIIcII')            # 'K' status data 'K' status data
+
+def _filter_step(ser, frame, sample):
+    """
+    Push one sample through the filter with a single UART round-trip.
+    'frame' is a private copy of _FSTEP_HALF * 2 that is patched in place.
+    Returns (ok_w1, ok_w2, status, data) for the settled capture; status and
+    data are None on a short read. If out_cnt was still 0, falls back to
+    polling STATUS before popping.
+    """
+    for off in _FSTEP_DIN:
+        _RRESP.pack_into(frame, off, sample)
+    _fit_timeout(ser, len(frame) + _FSTEP_RESP.size)
+    ser.write(frame)
+    raw = _read_resp(ser, _FSTEP_RESP.size)
+    if len(raw) != _FSTEP_RESP.size:
+        print(f"[-] Filter step failed for 0x{sample:03X}. Resp len: {len(raw)}")
+        return False, False, None, None
+    ack1, _, _, ack2, status, data = _FSTEP_RESP.unpack(raw)
+    if (status & 0xF) == 0:
+        status = wait_ready(ser, ADDR_FILTER_STATUS, 0xF)
+        data = ahb_read(ser, ADDR_FILTER_OUT)
+    return ack1 == b'K', ack2 == b'K', status, data
+
+# Test vectors matching reference_tb.v init_filter_test_vectors()
+# (a mix of positive, negative, and boundary 12-bit values)
+FILTER_SAMPLES = (
+    0x100,  # Small positive
+    0x200,  # Medium positive
+    0x400,  # Larger positive
+    0x7FF,  # Max positive (2047)
+    0x800,  # Min negative (-2048)
+    0xA00,  # Negative
+    0xC00,  # More negative
+    0xFFF,  # -1 in 12-bit 2's complement
+    0x050,  # Small value
+    0x1AB,  # Arbitrary pattern 1
+    0x2CD,  # Arbitrary pattern 2
+    0x3EF,  # Arbitrary pattern 3
+    0x444,  # Test pattern 4
+    0x555,  # Test pattern 5
+    0x666,  # Test pattern 6
+    0x777,  # Test pattern 7
+)
+
+def test_filter(ser, verbose=False):
     print("\n" + "=" * 56)
     print("  TEST: Filter Chain (Slave 3) — 6-Stage Wireline Receiver")
     print("=" * 56)
@@ -238,14 +575,21 @@ def test_filter(ser):
     print("    fec_dout (captured into out_fifo) to be 0. Fix: connect lpf_voted_out")
     print("    to u_filter_chain's LPF output or to rcvr_data_out.")
 
+    # Golden outputs for the whole vector set in one vectorized pass, run on
+    # a worker thread so it (with the numpy/numba import and any numba
+    # compile/cache load) overlaps the STEP 0/1 UART round-trips; serial
+    # reads release the GIL. FILTER_SAMPLES are already 12-bit values.
+    pool = ThreadPoolExecutor(max_workers=1)
+    golden_future = pool.submit(lambda: FilterChainModel().run_batch(FILTER_SAMPLES))
+    pool.shutdown(wait=False)   # the worker exits once the job is done
+
     # ---------------------------------------------------------------
     # STEP 0: Enable filter (bit0 of CONTROL register, offset 0x08)
     # ---------------------------------------------------------------
-    print("\n[*] Enabling filter (writing 0x1 to CONTROL @ 0x{:08X})...".format(ADDR_FILTER_CTRL))
+    print(f"\n[*] Enabling filter (writing 0x1 to CONTROL @ {_H_FILTER_CTRL})...")
     if not ahb_write(ser, ADDR_FILTER_CTRL, 0x00000001):
         print("[-] FATAL: Could not enable filter slave. Aborting test.")
         return
-    time.sleep(0.01)
 
     # Verify control register
     ctrl_rd = ahb_read(ser, ADDR_FILTER_CTRL)
@@ -258,45 +602,27 @@ def test_filter(ser):
     # STEP 1: Drain any stale entries from output FIFO
     # ---------------------------------------------------------------
     print("[*] Draining stale output FIFO entries...")
-    for _ in range(8):                          # FIFO_DEPTH = 8
-        status = ahb_read(ser, ADDR_FILTER_STATUS)
-        if status is None:
-            break
-        out_cnt = status & 0xF
-        if out_cnt == 0:
-            break
-        ahb_read(ser, ADDR_FILTER_OUT)          # pop and discard
+    status = ahb_read(ser, ADDR_FILTER_STATUS)
+    stale = (status & 0xF) if status is not None else 0   # out_cnt <= FIFO_DEPTH = 8
+    if stale:
+        ahb_read_batch(ser, [ADDR_FILTER_OUT] * stale)      # pop and discard in one batch
 
     # ---------------------------------------------------------------
-    # STEP 2: Instantiate golden model (RTL-accurate simulation)
+    # STEP 2: Collect golden model results (computed during STEP 0/1)
     # ---------------------------------------------------------------
-    golden_model = FilterChainModel()
-
-    # Test vectors matching reference_tb.v init_filter_test_vectors()
-    # (a mix of positive, negative, and boundary 12-bit values)
-    samples = [
-        0x100,  # Small positive
-        0x200,  # Medium positive
-        0x400,  # Larger positive
-        0x7FF,  # Max positive (2047)
-        0x800,  # Min negative (-2048)
-        0xA00,  # Negative
-        0xC00,  # More negative
-        0xFFF,  # -1 in 12-bit 2's complement
-        0x050,  # Small value
-        0x1AB,  # Arbitrary pattern 1
-        0x2CD,  # Arbitrary pattern 2
-        0x3EF,  # Arbitrary pattern 3
-        0x444,  # Test pattern 4
-        0x555,  # Test pattern 5
-        0x666,  # Test pattern 6
-        0x777,  # Test pattern 7
-    ]
-
-    hw_outputs   = []
-    golden_out   = []
-    per_sample   = []
-    pass_all     = True
+    samples    = FILTER_SAMPLES
+    golden_out = golden_future.result().tolist()
+    pass_all   = True
+
+    # Per-sample results, one column per field (12-bit values fit in int16)
+    n_samples = len(samples)
+    inputs   = np.zeros(n_samples, np.int16)
+    goldens  = np.array(golden_out, np.int16)
+    hws      = np.zeros(n_samples, np.int16)
+    in_cnts  = np.zeros(n_samples, np.int8)
+    out_cnts = np.zeros(n_samples, np.int8)
+    hw_valid = np.zeros(n_samples, bool)   # False on a read/write error
+    ok_mask  = np.zeros(n_samples, bool)
 
     # ---------------------------------------------------------------
     # STEP 3: Write each sample, read result, compare
@@ -308,55 +634,41 @@ def test_filter(ser):
     #   PIPELINE_LAT=6 in the RTL is shorter than the actual filter depth
     #   (~12 cycles).  The first write captures fec_dout after only 6 cycles
     #   (still 0 from pipeline startup).  Between UART transactions the FPGA
-    #   runs ~78 000 clock cycles (at 100 MHz / 115200 baud), so the pipeline
+    #   runs ~10 000 clock cycles (at 100 MHz / 921600 baud), so the pipeline
     #   is fully settled before the second write.  The second write triggers a
     #   fresh capture 6 cycles later from a settled pipeline state.
     #   We drain the stale first-write FIFO entry before reading the settled one.
     # ---------------------------------------------------------------
-    print(f"\n[*] DATA_IN  write : 0x{ADDR_FILTER:08X}")
-    print(f"[*] DATA_OUT read  : 0x{ADDR_FILTER_OUT:08X}")
-    print(f"[*] STATUS   read  : 0x{ADDR_FILTER_STATUS:08X}")
+    print(f"\n[*] DATA_IN  write : {_H_FILTER}")
+    print(f"[*] DATA_OUT read  : {_H_FILTER_OUT}")
+    print(f"[*] STATUS   read  : {_H_FILTER_STATUS}")
     print(f"\n[*] Running {len(samples)} test vectors (matching reference_tb.v)")
 
-    print(f"\n{'Sample':>6} {'Input':>8} {'Golden':>8} {'HW Out':>8} {'Status':>8}")
-    print("-" * 48)
+    # Table rows are collected and written once after the loop
+    rows = [f"\n{'Sample':>6} {'Input':>8} {'Golden':>8} {'HW Out':>8} {'Status':>8}", "-" * 48]
 
+    frame = bytearray(_FSTEP_HALF * 2)
     for idx, sample in enumerate(samples):
         sample_12b = sample & 0xFFF
+        inputs[idx] = sample_12b
 
         # --- Compute golden expected output (informational) ---
-        g_out = golden_model.run_sample(sample_12b)
-        golden_out.append(g_out)
+        g_out = golden_out[idx]
         g_signed = g_out if g_out < 0x800 else g_out - 0x1000
 
-        # --- PRIME WRITE: push sample into pipeline ---
-        #     First capture will be stale (0) due to PIPELINE_LAT < actual depth
-        ok_w1 = ahb_write(ser, ADDR_FILTER, sample_12b)
-        time.sleep(0.05)
-
-        # Drain stale first-write entry
-        st1 = ahb_read(ser, ADDR_FILTER_STATUS)
-        if st1 is not None and (st1 & 0xF) > 0:
-            ahb_read(ser, ADDR_FILTER_OUT)
-
+        # --- PRIME WRITE: push sample into pipeline, then drain its stale ---
+        #     capture (0, since PIPELINE_LAT < actual depth)
         # --- SETTLED WRITE: pipeline has been running at steady state ---
         #     Next capture reflects the settled pipeline (or 0 if lpf_voted_out
         #     is undriven in this bitstream — see RTL note above)
-        ok_w2 = ahb_write(ser, ADDR_FILTER, sample_12b)
-        time.sleep(0.05)
-
-        # --- Check STATUS ---
-        status = ahb_read(ser, ADDR_FILTER_STATUS)
+        # Both writes and both STATUS + DATA_OUT pops share one round-trip.
+        ok_w1, ok_w2, status, result = _filter_step(ser, frame, sample_12b)
         out_cnt = (status & 0xF)        if status is not None else 0
         in_cnt  = ((status >> 8) & 0xF) if status is not None else 0
 
-        # --- Read settled result ---
-        result = ahb_read(ser, ADDR_FILTER_OUT)
-
         if result is not None and (ok_w1 or ok_w2):
             hw_val    = result & 0xFFF
             hw_signed = hw_val if hw_val < 0x800 else hw_val - 0x1000
-            hw_outputs.append(hw_val)
 
             # Pass criterion matching reference_tb.v:
             # Any readable value means the AHB slave responded correctly.
@@ -372,121 +684,120 @@ def test_filter(ser):
                 pass_all = False
 
             status_str = "PASS" if sample_pass else "FAIL"
-            per_sample.append({
-                'input': sample_12b, 'golden': g_out, 'hw': hw_val,
-                'in_cnt': in_cnt, 'out_cnt': out_cnt, 'ok': sample_pass
-            })
-            print(f"{idx+1:>6} {sample_12b:>8} (0x{sample_12b:03X}) "
-                  f" {g_out:>5} (0x{g_out:03X}) "
-                  f" {hw_val:>5} (0x{hw_val:03X}) "
-                  f" [{status_str}]")
+            hws[idx], in_cnts[idx], out_cnts[idx] = hw_val, in_cnt, out_cnt
+            hw_valid[idx], ok_mask[idx] = True, sample_pass
+            rows.append(f"{idx+1:>6} {sample_12b:>8} (0x{sample_12b:03X}) "
+                        f" {g_out:>5} (0x{g_out:03X}) "
+                        f" {hw_val:>5} (0x{hw_val:03X}) "
+                        f" [{status_str}]")
         else:
-            print(f"{idx+1:>6} {sample_12b:>8}   --- read/write error ---      [FAIL]")
+            rows.append(f"{idx+1:>6} {sample_12b:>8}   --- read/write error ---      [FAIL]")
             pass_all = False
-            per_sample.append({'input': sample_12b, 'golden': g_out, 'hw': None, 'ok': False})
 
-        # Small gap between samples (matches reference_tb.v repeat(2) @negedge)
-        time.sleep(0.01)
+    sys.stdout.write("\n".join(rows) + "\n")
 
     # ---------------------------------------------------------------
-    # STEP 4: Detailed per-sample breakdown
+    # STEP 4: Detailed per-sample breakdown (--filter-verbose)
     # ---------------------------------------------------------------
-    print("\n" + "=" * 56)
-    print("  FILTER CHAIN DETAILED RESULTS")
-    print("=" * 56)
-    for idx, rec in enumerate(per_sample):
-        hw_s = rec['hw'] if rec['hw'] is None else (rec['hw'] if rec['hw'] < 0x800 else rec['hw'] - 0x1000)
-        g_s  = rec['golden'] if rec['golden'] < 0x800 else rec['golden'] - 0x1000
-        print(f"  Sample {idx+1}:")
-        print(f"    Input         : 0x{rec['input']:03X} ({rec['input']:>5}  signed={rec['input'] if rec['input']<0x800 else rec['input']-0x1000})")
-        print(f"    Golden (model): 0x{rec['golden']:03X} ({rec['golden']:>5}  signed={g_s})")
-        if rec['hw'] is not None:
-            print(f"    HW Output     : 0x{rec['hw']:03X} ({rec['hw']:>5}  signed={hw_s})")
-            print(f"    Delta (HW-G)  : {hw_s - g_s}")
-            print(f"    FIFO Status   : in_cnt={rec.get('in_cnt','-')}, out_cnt={rec.get('out_cnt','-')}")
-            print(f"    Result        : {'[+] PASS' if rec['ok'] else '[-] FAIL'}")
-        else:
-            print(f"    HW Output     : READ/WRITE ERROR")
-            print(f"    Result        : [-] FAIL")
+    # Both blocks are assembled as line lists and written once, like the table.
+    if verbose:
+        lines = ["\n" + "=" * 56, "  FILTER CHAIN DETAILED RESULTS", "=" * 56]
+        # Sign-extend the 12-bit columns in one pass each
+        in_s, g_s_col, hw_s_col = ((a ^ 0x800) - 0x800 for a in (inputs, goldens, hws))
+        cols = zip(inputs.tolist(), in_s.tolist(), goldens.tolist(), g_s_col.tolist(),
+                   hws.tolist(), hw_s_col.tolist(), in_cnts.tolist(), out_cnts.tolist(),
+                   hw_valid.tolist(), ok_mask.tolist())
+        for idx, (inp, inp_s, g, g_s, hw, hw_s, i_cnt, o_cnt, valid, ok) in enumerate(cols):
+            lines.append(f"  Sample {idx+1}:\n"
+                         f"    Input         : 0x{inp:03X} ({inp:>5}  signed={inp_s})\n"
+                         f"    Golden (model): 0x{g:03X} ({g:>5}  signed={g_s})")
+            if valid:
+                lines.append(f"    HW Output     : 0x{hw:03X} ({hw:>5}  signed={hw_s})\n"
+                             f"    Delta (HW-G)  : {hw_s - g_s}\n"
+                             f"    FIFO Status   : in_cnt={i_cnt}, out_cnt={o_cnt}\n"
+                             f"    Result        : {'[+] PASS' if ok else '[-] FAIL'}")
+            else:
+                lines.append(f"    HW Output     : READ/WRITE ERROR\n"
+                             f"    Result        : [-] FAIL")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     # ---------------------------------------------------------------
     # STEP 5: Overall status
     # ---------------------------------------------------------------
-    pass_cnt = sum(1 for r in per_sample if r['ok'])
-    fail_cnt = len(per_sample) - pass_cnt
-    print("\n" + "=" * 56)
-    print(f"  FILTER CHAIN SUMMARY:  {pass_cnt}/{len(per_sample)} PASSED")
-    print("=" * 56)
+    pass_cnt = int(ok_mask.sum())
+    fail_cnt = n_samples - pass_cnt
+    lines = ["\n" + "=" * 56,
+             f"  FILTER CHAIN SUMMARY:  {pass_cnt}/{n_samples} PASSED",
+             "=" * 56]
     if pass_all:
-        print("  [+] FILTER TEST PASS: All AHB transactions completed successfully.")
-        print("  [+] Filter slave is reachable and FIFO mechanics are operational.")
-        print("  [i] Golden model delta reflects RTL's lpf_voted_out open-wire issue")
-        print("      (fec_dout always 0).  Fix RTL to compare actual filter outputs.")
+        lines += ["  [+] FILTER TEST PASS: All AHB transactions completed successfully.",
+                  "  [+] Filter slave is reachable and FIFO mechanics are operational.",
+                  "  [i] Golden model delta reflects RTL's lpf_voted_out open-wire issue",
+                  "      (fec_dout always 0).  Fix RTL to compare actual filter outputs."]
     else:
-        print("  [-] FILTER TEST FAIL: One or more AHB transactions failed.")
-        print("  [-] Check: serial connection, filter enabled, FPGA programmed.")
-    print("=" * 56)
+        lines += ["  [-] FILTER TEST FAIL: One or more AHB transactions failed.",
+                  "  [-] Check: serial connection, filter enabled, FPGA programmed."]
+    lines.append("=" * 56)
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def _aes_done(ser, label):
+    """Poll STATUS for DONE; prints '<label> FAIL' and returns False if it is not seen."""
+    status = wait_ready(ser, ADDR_AES_CTRL, AES_STATUS_DONE, timeout=AES_TIMEOUT)
+    if status is None:
+        print(f"[-] {label} FAIL (status read error)")
+        return False
+    if not status & AES_STATUS_DONE:
+        print(f"[-] {label} FAIL (DONE not seen within {AES_TIMEOUT * 1000:.0f} ms)")
+        return False
+    return True
 
 def test_aes(ser):
     print("\n--- Testing AES (Slave 4) ---")
     # Assuming standard AES slave mapping:
     # 0x00-0x0F: Key
     # 0x10-0x1F: Plaintext
-    # 0x20: Control/Status (Write 1 to start)
+    # 0x20: Control/Status (Write 1 to start; read bit1 = DONE)
     # 0x30-0x3F: Ciphertext
     
-    # 1. Write Key (Dummy)
-    print("[*] Writing AES Key...")
+    # 1-3. Write Key (Dummy) and Plaintext (example), then Start Encryption.
+    # Key, plaintext and CONTROL are contiguous (0x00-0x20), so all nine
+    # words go out as a single burst, start last (on AHB: INCR4 key,
+    # INCR4 plaintext, SINGLE start).
+    print("[*] Writing AES Key and Plaintext, Starting Encryption...")
     key = [0xFFFFFFFF, 0xFFFFFFFF, 0xFFFFFFFF, 0xFFFFFFFF]
-    for i in range(4):
-        ahb_write(ser, ADDR_AES + (i*4), key[i])
-
-    # 2. Write Plaintext (example)
-    print("[*] Writing AES Plaintext...")
     plaintext = [0x12345678, 0x9ABCDEF0, 0x0F1E2D3C, 0x4B5A6978]
-    for i in range(4):
-        ahb_write(ser, ADDR_AES + 0x10 + (i*4), plaintext[i])
-
-    # 3. Start Encryption
-    print("[*] Starting Encryption...")
-    ahb_write(ser, ADDR_AES + 0x20, 1)
+    if not ahb_write_burst(ser, ADDR_AES, key + plaintext + [1]):
+        print("[-] AES Test FAIL (burst write not ACKed; bridge without burst support?)")
+        return
 
-    # 4. Wait for completion (UART delay is usually enough)
-    time.sleep(0.05)
+    # 4. Wait for completion: STATUS bit1 = DONE (cleared by the start write)
+    if not _aes_done(ser, "AES Test"):
+        return
 
     # 5. Read Ciphertext
     print("[*] Reading Ciphertext...")
-    ciphertext = []
-    for i in range(4):
-        c = ahb_read(ser, ADDR_AES + 0x30 + (i*4))
-        ciphertext.append(c)
-        print(f"[*] Ciphertext[{i}]: 0x{c:08X}" if c is not None else f"[-] AES Test FAIL (Read Error)")
-
-    if None in ciphertext:
+    ciphertext = ahb_read_burst(ser, ADDR_AES + 0x30, 4)
+    if ciphertext is None:
         print("[-] AES Test FAIL (Read Error)")
         return
+    print("[*] Ciphertext: " + " ".join(f"{c:08X}" for c in ciphertext))
 
-    # 6. Write Ciphertext as new input (simulate decryption)
-    print("[*] Writing Ciphertext as input for decryption...")
-    for i in range(4):
-        ahb_write(ser, ADDR_AES + 0x10 + (i*4), ciphertext[i])
-
-    # 7. Start Encryption again (XOR model: encrypting ciphertext with same key should return plaintext)
-    print("[*] Starting Decryption (re-encrypt with same key)...")
-    ahb_write(ser, ADDR_AES + 0x20, 1)
-    time.sleep(0.05)
+    # 6+7. Write Ciphertext as new input (simulate decryption) and start encryption
+    # again in one burst (XOR model: encrypting ciphertext with same key should return plaintext)
+    print("[*] Writing Ciphertext as input, Starting Decryption (re-encrypt with same key)...")
+    if not ahb_write_burst(ser, ADDR_AES + 0x10, ciphertext + [1]):
+        print("[-] AES Decrypt FAIL (burst write not ACKed)")
+        return
+    if not _aes_done(ser, "AES Decrypt"):
+        return
 
     # 8. Read Decrypted Text
     print("[*] Reading Decrypted Text...")
-    decrypted = []
-    for i in range(4):
-        d = ahb_read(ser, ADDR_AES + 0x30 + (i*4))
-        decrypted.append(d)
-        print(f"[*] Decrypted[{i}]: 0x{d:08X}" if d is not None else f"[-] AES Decrypt FAIL (Read Error)")
-
-    if None in decrypted:
+    decrypted = ahb_read_burst(ser, ADDR_AES + 0x30, 4)
+    if decrypted is None:
         print("[-] AES Decrypt FAIL (Read Error)")
         return
+    print("[*] Decrypted:  " + " ".join(f"{d:08X}" for d in decrypted))
 
     # 9. Compare decrypted with original plaintext
     if decrypted == plaintext:
@@ -494,47 +805,79 @@ def test_aes(ser):
     else:
         print("[-] AES Encrypt/Decrypt Test FAIL (decrypted does not match original)")
 
-def power_analysis_loop(ser):
-    print("\n==================================================")
-    print("       POWER CONSUMPTION ANALYSIS MODE")
-    print("==================================================")
-    print("This mode runs a high-traffic loop to stress the bus.")
-    print("You can measure the FPGA power (current) during the loops.")
-    
-    # 1. Disable Clock Gating
-    print("\n[STEP 1] Disabling Clock Gating (High Power Mode)...")
-    ahb_write(ser, ADDR_SYS, 0)
-    input(">>> Press ENTER to start traffic loop (Gating OFF)...")
-    print("[*] Running traffic for 10 seconds...")
-    start_time = time.time()
+# Each traffic round queues TRAFFIC_ROUND iterations of the 4-op pattern
+# (write RAM1, read RAM1, write FILTER, read FILTER) = 64 AHB ops per pipelined round.
+# The round never changes, so it is packed once at import time.
+TRAFFIC_ROUND = 16
+TRAFFIC = (_WCMD.pack(0x57, ADDR_RAM1, 0xAAAA5555) +
+           _RCMD.pack(0x52, ADDR_RAM1) +
+           _WCMD.pack(0x57, ADDR_FILTER, 0x123) +
+           _RCMD.pack(0x52, ADDR_FILTER)) * TRAFFIC_ROUND
+RESP_LEN = (1 + 4 + 1 + 4) * TRAFFIC_ROUND   # 'K' + 4B data + 'K' + 4B data per iteration
+
+def _traffic_loop(ser, duration):
+    """
+    Stress the bus for 'duration' seconds. Returns (iterations of the 4-op
+    pattern, complete); complete is False if a short response ended the
+    window early or lost its last round.
+    """
+    # Each round is already a 64-op pipelined batch (several ms), so checking the
+    # deadline once per round is negligible and keeps overshoot to one round.
+    # Rounds are double-buffered: the next one is queued before the current
+    # one's responses are collected, so the link never idles for the host's
+    # read turnaround (up to a full USB latency-timer period).
+    _fit_timeout(ser, 2 * len(TRAFFIC) + RESP_LEN)
+    deadline = time.monotonic() + duration
     ops = 0
-    while time.time() - start_time < 10:
-        ahb_write(ser, ADDR_RAM1, 0xAAAA5555)
-        ahb_read(ser, ADDR_RAM1)
-        ahb_write(ser, ADDR_FILTER, 0x123)
-        ahb_read(ser, ADDR_FILTER)
-        ops += 1
-    print(f"[+] Done. Operations performed: {ops}")
-    # Prompt for measured power
-    power_high = input("Enter measured power (High Power Mode, mW): ")
-    
-    # 2. Enable Clock Gating
-    print("\n[STEP 2] Enabling Clock Gating (Low Power Mode)...")
-    ahb_write(ser, ADDR_SYS, 1)
-    input(">>> Press ENTER to start traffic loop (Gating ON)...")
+    ser.write(TRAFFIC)
+    # On a short read the round queued behind the current one is still owed
+    while time.monotonic() < deadline:
+        ser.write(TRAFFIC)
+        if len(_read_resp(ser, RESP_LEN, owed=RESP_LEN)) != RESP_LEN:
+            print("[-] Traffic loop: short response (timeout), stopping early")
+            return ops, False
+        ops += TRAFFIC_ROUND
+    if len(_read_resp(ser, RESP_LEN)) != RESP_LEN:   # collect the round still in flight
+        print("[-] Traffic loop: short response on the final round")
+        return ops, False
+    return ops + TRAFFIC_ROUND, True
+
+def _wait_start(auto, settle, prompt):
+    """Interactive: wait for ENTER. Auto: let the rails settle for 'settle' seconds."""
+    if auto:
+        print(f"[*] Settling for {settle:.1f} s...")
+        time.sleep(settle)
+    else:
+        input(prompt)
+
+def _timed_traffic(ser, mode, windows):
+    """
+    Run one 10 s traffic window, recording (mode, t_start, t_end, ops,
+    complete) in wall-clock time. Returns complete.
+    """
     print("[*] Running traffic for 10 seconds...")
-    start_time = time.time()
-    ops = 0
-    while time.time() - start_time < 10:
-        ahb_write(ser, ADDR_RAM1, 0xAAAA5555)
-        ahb_read(ser, ADDR_RAM1)
-        ahb_write(ser, ADDR_FILTER, 0x123)
-        ahb_read(ser, ADDR_FILTER)
-        ops += 1
+    t_start = time.time()
+    ops, complete = _traffic_loop(ser, 10)
+    t_end = time.time()
+    windows.append((mode, t_start, t_end, ops, complete))
     print(f"[+] Done. Operations performed: {ops}")
-    power_low = input("Enter measured power (Low Power Mode, mW): ")
-    
-    # Comparison
+    return complete
+
+def _report_windows(windows, log_path):
+    """Print the traffic windows and, with log_path, write them as CSV."""
+    print("\n[*] Traffic windows (correlate with the power-meter log):")
+    for mode, t_start, t_end, ops, complete in windows:
+        print(f"    {mode:<10} {t_start:.6f} -> {t_end:.6f}  ({ops} ops)"
+              + ("" if complete else "  [SHORT]"))
+    if log_path:
+        with open(log_path, 'w', newline='') as f:
+            w = csv.writer(f)
+            w.writerow(('mode', 't_start', 't_end', 'ops', 'complete'))
+            w.writerows((m, f"{t0:.6f}", f"{t1:.6f}", n, int(c)) for m, t0, t1, n, c in windows)
+        print(f"[+] Timestamps written to {log_path}")
+
+def _compare_power(power_high, power_low):
+    """Print the gating-off vs gating-on comparison from the entered readings."""
     try:
         power_high = float(power_high)
         power_low = float(power_low)
@@ -547,12 +890,80 @@ def power_analysis_loop(ser):
     except ValueError:
         print("[-] Invalid input for power values. Comparison skipped.")
 
+def power_analysis_loop(ser, auto=False, settle=2.0, log_path=None):
+    """
+    Interactive by default. With auto=True the ENTER prompts become a 'settle'
+    second pause after each clock-gating change and no power readings are
+    asked for; instead each traffic window's start/end time (Unix seconds,
+    microsecond resolution) is printed and, with log_path, written as CSV so
+    an external power-meter log can be correlated against it.
+    Returns False if a clock-gating write was not ACKed or a traffic window
+    ended short, so an unattended run can report the failure.
+    """
+    windows = []
+    readings = []   # interactive mode: measured power per phase, in mW
+    print("\n==================================================")
+    print("       POWER CONSUMPTION ANALYSIS MODE")
+    print("==================================================")
+    print("This mode runs a high-traffic loop to stress the bus.")
+    print("You can measure the FPGA power (current) during the loops.")
+    
+    # 1. Disable Clock Gating
+    print("\n[STEP 1] Disabling Clock Gating (High Power Mode)...")
+    ok = ahb_write(ser, ADDR_SYS, 0)
+    _wait_start(auto, settle, ">>> Press ENTER to start traffic loop (Gating OFF)...")
+    ok &= _timed_traffic(ser, 'gating_off', windows)
+    # Prompt for measured power
+    if not auto:
+        readings.append(input("Enter measured power (High Power Mode, mW): "))
+    
+    # 2. Enable Clock Gating
+    print("\n[STEP 2] Enabling Clock Gating (Low Power Mode)...")
+    ok &= ahb_write(ser, ADDR_SYS, 1)
+    _wait_start(auto, settle, ">>> Press ENTER to start traffic loop (Gating ON)...")
+    ok &= _timed_traffic(ser, 'gating_on', windows)
+    if not auto:
+        readings.append(input("Enter measured power (Low Power Mode, mW): "))
+
+    # Comparison (interactive) or timestamp report (auto)
+    if auto:
+        _report_windows(windows, log_path)
+    else:
+        _compare_power(*readings)
+    return ok
+
 # ==============================================================================
 # MAIN
 # ==============================================================================
 if __name__ == "__main__":
-    ser = open_serial()
-    if ser:
+    parser = argparse.ArgumentParser(description="AMBA SoC UART/AHB test menu")
+    parser.add_argument('--port', default=SERIAL_PORT, help=f"serial port (default: {SERIAL_PORT})")
+    parser.add_argument('--baud', type=int, default=BAUD_RATE, help=f"baud rate (default: {BAUD_RATE})")
+    parser.add_argument('--filter-verbose', action='store_true',
+                        help="print the per-sample breakdown in the filter test")
+    parser.add_argument('--auto', action='store_true',
+                        help="run the power analysis non-interactively and exit")
+    parser.add_argument('--settle', type=float,
+                        help="with --auto: seconds to wait after each clock-gating change (default: 2.0)")
+    parser.add_argument('--log', metavar='CSV',
+                        help="with --auto: write the traffic window timestamps to this CSV file")
+    args = parser.parse_args()
+    if not args.auto and (args.settle is not None or args.log):
+        parser.error("--settle and --log require --auto")
+    if args.settle is not None and args.settle < 0:
+        parser.error("--settle must not be negative")
+
+    ser = open_serial(args.port, args.baud)
+    if args.auto:
+        # Unattended runs report a failed open or a short window in the exit status
+        if ser is None:
+            sys.exit(1)
+        settle = 2.0 if args.settle is None else args.settle
+        ok = power_analysis_loop(ser, auto=True, settle=settle, log_path=args.log)
+        ser.close()
+        if not ok:
+            sys.exit(1)
+    elif ser:
         while True:
             print("\n--- AMBA Test Menu ---")
             print("1. Test RAM")
@@ -566,7 +977,7 @@ if __name__ == "__main__":
             if choice == '1':
                 test_ram(ser)
             elif choice == '2':
-                test_filter(ser)
+                test_filter(ser, verbose=args.filter_verbose)
             elif choice == '3':
                 test_aes(ser)
             elif choice == '4':
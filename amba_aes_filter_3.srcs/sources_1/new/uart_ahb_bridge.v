@@ -22,16 +22,63 @@ module uart_ahb_bridge (
     input wire [1:0] hresp
 );
 
+    // Commands (all fields big-endian):
+    //   'W' <addr:4> <data:4>             -> 'K'
+    //   'R' <addr:4>                      -> <data:4>
+    //   'B' <addr:4> <n:1> <data:4>*n     -> 'K' after the last write (burst write)
+    //   'D' <addr:4> <n:1>                -> <data:4>*n                (burst read)
+    // Bursts access n consecutive words (addr, addr+4, ...); n = 0 is a no-op.
+    // Burst writes are issued on AHB as INCR4 bursts (one beat per cycle,
+    // NONSEQ + 3 x SEQ) while at least 4 words remain and the 4 beats stay
+    // inside one 1KB page; the remainder goes out as SINGLE transfers. Each
+    // INCR4 group is buffered in full before its first beat. As everywhere
+    // in this SoC, HWDATA is driven alongside HADDR (the slaves sample both
+    // in the same cycle).
+
     // State Machine
-    localparam IDLE = 0, GET_ADDR = 1, GET_DATA = 2, AHB_SETUP = 3, AHB_ACCESS = 4, SEND_RESP = 5, SEND_DATA = 6, AHB_DATA_PHASE = 7, TX_WAIT = 8;
+    localparam IDLE = 0, GET_ADDR = 1, GET_DATA = 2, AHB_SETUP = 3, AHB_ACCESS = 4, SEND_RESP = 5, SEND_DATA = 6, AHB_DATA_PHASE = 7, TX_WAIT = 8, GET_COUNT = 9, AHB_BURST = 10;
     
     reg [3:0] state;
     reg [2:0] byte_cnt;
     reg [7:0] cmd;
+    reg [7:0] burst_cnt; // Words left in the current burst, including the one in flight
+    reg [1:0] beat;      // INCR4: words buffered while collecting / next beat while issuing
+    reg [31:0] wbuf [0:2]; // INCR4: first 3 words of the group (the 4th stays in data_reg)
     reg [31:0] addr_reg;
     reg [31:0] data_reg;
     reg [31:0] read_data_reg;
 
+    // RX byte FIFO
+    // The host pipelines several command frames back-to-back, so bytes keep
+    // arriving while a read response is still being shifted out on TX.
+    localparam RXF_AW = 5; // 32 bytes
+    reg [7:0] rx_fifo [0:(1<<RXF_AW)-1];
+    reg [RXF_AW:0] rx_wptr, rx_rptr;
+    wire rx_empty = (rx_wptr == rx_rptr);
+    wire rx_full  = (rx_wptr[RXF_AW] != rx_rptr[RXF_AW]) &&
+                    (rx_wptr[RXF_AW-1:0] == rx_rptr[RXF_AW-1:0]);
+    wire [7:0] rxq_data = rx_fifo[rx_rptr[RXF_AW-1:0]];
+    wire rxq_pop = !rx_empty && (state == IDLE || state == GET_ADDR || state == GET_DATA || state == GET_COUNT);
+
+    wire cmd_write = (cmd == 8'h57 || cmd == 8'h42); // 'W' or 'B'
+    wire cmd_burst = (cmd == 8'h42 || cmd == 8'h44); // 'B' or 'D'
+    // Next burst-write group is an INCR4 (burst_cnt/addr_reg describe the group
+    // start and only change once the whole group has completed)
+    wire incr4_ok  = (cmd == 8'h42) && (burst_cnt >= 4) && (addr_reg[9:2] <= 8'd252);
+
+    always @(posedge hclk or negedge hresetn) begin
+        if (!hresetn) begin
+            rx_wptr <= 0;
+            rx_rptr <= 0;
+        end else begin
+            if (rx_dv && !rx_full) begin
+                rx_fifo[rx_wptr[RXF_AW-1:0]] <= rx_data;
+                rx_wptr <= rx_wptr + 1;
+            end
+            if (rxq_pop) rx_rptr <= rx_rptr + 1;
+        end
+    end
+
     always @(posedge hclk or negedge hresetn) begin
         if (!hresetn) begin
             state <= IDLE;
@@ -44,6 +91,8 @@ module uart_ahb_bridge (
             hprot <= 4'b0011;
             tx_start <= 0;
             byte_cnt <= 0;
+            burst_cnt <= 0;
+            beat <= 0;
         end else begin
             tx_start <= 0; // Default
             
@@ -51,44 +100,86 @@ module uart_ahb_bridge (
                 IDLE: begin
                     htrans <= 0;
                     byte_cnt <= 0;
-                    if (rx_dv) begin
-                        cmd <= rx_data;
-                        if (rx_data == 8'h57 || rx_data == 8'h52) // 'W' or 'R'
+                    if (rxq_pop) begin
+                        cmd <= rxq_data;
+                        if (rxq_data == 8'h57 || rxq_data == 8'h52 ||  // 'W' or 'R'
+                            rxq_data == 8'h42 || rxq_data == 8'h44)    // 'B' or 'D'
                             state <= GET_ADDR;
                     end
                 end
 
                 GET_ADDR: begin
-                    if (rx_dv) begin
-                        addr_reg <= {addr_reg[23:0], rx_data};
+                    if (rxq_pop) begin
+                        addr_reg <= {addr_reg[23:0], rxq_data};
                         byte_cnt <= byte_cnt + 1;
                         if (byte_cnt == 3) begin
                             byte_cnt <= 0;
-                            if (cmd == 8'h57) state <= GET_DATA; // Write
-                            else state <= AHB_SETUP;             // Read
+                            if (cmd_burst) state <= GET_COUNT;     // Burst
+                            else if (cmd_write) state <= GET_DATA; // Write
+                            else state <= AHB_SETUP;               // Read
                         end
                     end
                 end
 
+                GET_COUNT: begin
+                    if (rxq_pop) begin
+                        burst_cnt <= rxq_data;
+                        beat <= 0;
+                        if (rxq_data == 0) state <= cmd_write ? SEND_RESP : IDLE;
+                        else if (cmd_write) state <= GET_DATA;
+                        else state <= AHB_SETUP;
+                    end
+                end
+
                 GET_DATA: begin
-                    if (rx_dv) begin
-                        data_reg <= {data_reg[23:0], rx_data};
+                    if (rxq_pop) begin
+                        data_reg <= {data_reg[23:0], rxq_data};
                         byte_cnt <= byte_cnt + 1;
                         if (byte_cnt == 3) begin
-                            state <= AHB_SETUP;
+                            if (incr4_ok && beat != 3) begin
+                                // Buffer INCR4 words until the 4th has arrived
+                                wbuf[beat] <= {data_reg[23:0], rxq_data};
+                                beat <= beat + 1;
+                                byte_cnt <= 0;
+                            end else begin
+                                state <= AHB_SETUP;
+                            end
                         end
                     end
                 end
 
                 AHB_SETUP: begin
                     haddr <= addr_reg;
-                    hwrite <= (cmd == 8'h57);
+                    hwrite <= cmd_write;
                     htrans <= 2'b10; // NONSEQ
                     hsize <= 3'b010; // 32-bit
-                    hburst <= 0;     // SINGLE
                     hprot <= 4'b0011; // Non-cacheable, Non-bufferable, Privileged, Data
-                    if (cmd == 8'h57) hwdata <= data_reg; // Setup data for write
-                    state <= AHB_ACCESS;
+                    if (incr4_ok) begin
+                        hburst <= 3'b011;  // INCR4
+                        hwdata <= wbuf[0]; // First beat
+                        beat <= 1;
+                        state <= AHB_BURST;
+                    end else begin
+                        hburst <= 0;     // SINGLE
+                        if (cmd_write) hwdata <= data_reg; // Setup data for write
+                        state <= AHB_ACCESS;
+                    end
+                end
+
+                AHB_BURST: begin
+                    // One INCR4 beat per cycle; beat wraps to 0 after the 4th
+                    if (hready) begin
+                        if (beat == 0) begin
+                            htrans <= 0; // IDLE for the last Data Phase
+                            hburst <= 0;
+                            state <= AHB_DATA_PHASE;
+                        end else begin
+                            haddr <= haddr + 4;
+                            hwdata <= (beat == 3) ? data_reg : wbuf[beat];
+                            htrans <= 2'b11; // SEQ
+                            beat <= beat + 1;
+                        end
+                    end
                 end
 
                 AHB_ACCESS: begin
@@ -106,6 +197,18 @@ module uart_ahb_bridge (
                             read_data_reg <= hrdata; // Capture read data
                             state <= SEND_DATA;
                             byte_cnt <= 3; // Send MSB first
+                        end else if (incr4_ok && burst_cnt > 4) begin
+                            // INCR4 group done: collect the next group, one ack at the end
+                            burst_cnt <= burst_cnt - 4;
+                            addr_reg <= addr_reg + 16;
+                            byte_cnt <= 0;
+                            state <= GET_DATA;
+                        end else if (!incr4_ok && cmd_burst && burst_cnt > 1) begin
+                            // Next burst word: collect its data, one ack at the end
+                            burst_cnt <= burst_cnt - 1;
+                            addr_reg <= addr_reg + 4;
+                            byte_cnt <= 0;
+                            state <= GET_DATA;
                         end else begin
                             state <= SEND_RESP; // Send Ack
                         end
@@ -136,7 +239,14 @@ module uart_ahb_bridge (
                 TX_WAIT: begin
                     if (tx_busy) begin
                         if (byte_cnt == 0) begin
-                            state <= IDLE;
+                            if (cmd_burst && burst_cnt > 1) begin
+                                // Next burst word
+                                burst_cnt <= burst_cnt - 1;
+                                addr_reg <= addr_reg + 4;
+                                state <= AHB_SETUP;
+                            end else begin
+                                state <= IDLE;
+                            end
                         end else begin
                             byte_cnt <= byte_cnt - 1;
                             state <= SEND_DATA;
@@ -5,6 +5,7 @@
 #         ./run_sim.sh compile   (compile only)
 #         ./run_sim.sh sim       (simulate only, assumes already compiled)
 #         ./run_sim.sh wave      (open GTKWave with existing dump.vcd)
+#         ./run_sim.sh bridge    (compile + run the UART-AHB bridge testbench)
 # =============================================================================
 
 set -e
@@ -92,6 +93,34 @@ do_wave() {
     gtkwave "$VCD" &
 }
 
+# --------------------------------------------------------------------------
+do_bridge() {
+    echo ""
+    echo "╔══════════════════════════════════════════╗"
+    echo "║  UART-AHB Bridge Testbench               ║"
+    echo "╚══════════════════════════════════════════╝"
+
+    iverilog -g2001 -Wall \
+        -o "$OUT_DIR/bridge_sim.out" \
+        "$SRC/uart_tx.v" \
+        "$SRC/uart_ahb_bridge.v" \
+        "$TB/uart_ahb_bridge_tb.v" \
+        2>&1 | tee "$OUT_DIR/bridge_compile.log"
+
+    # Run from OUT_DIR so bridge_dump.vcd lands there
+    cd "$OUT_DIR"
+    vvp "$OUT_DIR/bridge_sim.out" 2>&1 | tee "$OUT_DIR/bridge_simulate.log"
+
+    if grep -q "ALL BRIDGE TESTS PASSED" "$OUT_DIR/bridge_simulate.log"; then
+        echo ""
+        echo "✅ Bridge testbench passed. Log: $OUT_DIR/bridge_simulate.log"
+    else
+        echo ""
+        echo "❌ Bridge testbench failed. Check $OUT_DIR/bridge_simulate.log"
+        exit 1
+    fi
+}
+
 # --------------------------------------------------------------------------
 # Parse argument
 ACTION="${1:-all}"
@@ -106,6 +135,9 @@ case "$ACTION" in
     wave)
         do_wave
         ;;
+    bridge)
+        do_bridge
+        ;;
     all|*)
         do_compile
         do_simulate